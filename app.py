@@ -10,6 +10,7 @@
 #  2. Data persistence: Saves to 'gold_cache.json'.
 #  3. Full State Mapping: All 36 regions included.
 #  4. Sanity Checks: Rejects fake/paper gold rates automatically.
+#  5. Serving: gunicorn (gthread workers) in production, see entry point.
 # ==============================================================================
 from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS  # This is the line we added for Hostinger
@@ -17,24 +18,42 @@ from flask_cors import CORS  # This is the line we added for Hostinger
 app = Flask(__name__)
 CORS(app)  # This allows Hostinger to talk to Render
 import os
-import json
+import re
 import time
-import random
+import queue
+import atexit
+import tempfile
+import itertools
 import logging
+import logging.handlers
 import datetime
 import requests
 import threading
-from bs4 import BeautifulSoup
-from flask import Flask, render_template, jsonify, request
+import numpy as np
+import orjson
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
+from flask import Flask, Response, render_template, request
 from flask_cors import CORS
 
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock (local dev only)
+    fcntl = None
+
 # --- SYSTEM CONFIGURATION ---
 LOG_FILE = "goldprime_server.log"
 CACHE_FILE = "gold_cache.json"
+REFRESH_LOCK_FILE = "gold_refresh.lock"  # Held by the one process running the refresher
 
 # *** UPDATE: CACHE SET TO 1 HOUR ***
 CACHE_EXPIRY_SECONDS = 3600  # 1 Hour (60 mins * 60 secs)
-REQUEST_TIMEOUT = 5          # Seconds
+REQUEST_TIMEOUT = 5          # Seconds (read timeout)
+CONNECT_TIMEOUT = 2          # Seconds (TCP/TLS connect, retried once)
+REFRESH_RETRY_SECONDS = 60   # Backoff after a failed scheduled refresh
 
 # --- MARKET CONFIGURATION ---
 # The "Anchor" is the absolute fail-safe price (Feb 2026 Baseline).
@@ -47,15 +66,53 @@ FAILSAFE_ANCHOR_PRICE = 1
 MIN_VALID_PRICE = 140000
 MAX_VALID_PRICE = 180000
 
-# --- LOGGING SETUP ---
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()
-    ]
+# Characters stripped from scraped price cells ("₹1,56,000" -> "156000")
+_PRICE_STRIP = str.maketrans('', '', '₹,.')
+
+# First-column label of the 10-gram row ("10 Gram", "10 gm", "10g").
+# Rejects "100 gram" and history dates like "Oct 10, 2026".
+_TEN_GRAM_CELL = re.compile(r'(?<![\d.])10\s*(?:grams?|gms?|g)\b', re.I)
+
+# Fast path: pull the "10 gram 24K" rate straight out of the raw HTML.
+# Covers both "10 gram ... 24K ... price" and "24K ... 10 gram ... price".
+# The gaps between markers never cross a <tr>/<table> tag or another karat
+# marker (22K/18K/14K), so in table, <p> or <div> markup the price can't be
+# taken from a different row or a different karat. Layouts with the karat
+# only in a header row ("Gram | 24K Today | Yesterday") miss here and fall
+# through to the DOM scan, which knows which column is which.
+_OTHER_KARAT = r'(?<![\d,.])(?:22|18|14)\s*(?:k(?:t|arat)?\b|carat)'
+# Lazy gap that never crosses a row/table tag or another karat marker
+_IN_ROW = r'(?:(?!</?t(?:r|able)\b|' + _OTHER_KARAT + r').){0,300}?'
+# "10 gram", not "110 gram"
+_TEN_GRAM = r'(?<!\d)10\s*gram'
+# Explicit 24K/24 carat, never the "24" inside "1,56,240" or "Oct 24"
+_KARAT_24 = r'(?<![\d,.])24\s*(?:k(?:t|arat)?\b|carat)'
+# A whole number opening a text node (optionally after ₹)
+_PRICE_TEXT = r'(?:>|₹)\s*₹?\s*(\d[\d,]{4,8})(?![\d,])'
+_PRICE_RES = (
+    re.compile(_TEN_GRAM + _IN_ROW + _KARAT_24 + _IN_ROW + _PRICE_TEXT, re.I | re.S),
+    re.compile(_KARAT_24 + _IN_ROW + _TEN_GRAM + _IN_ROW + _PRICE_TEXT, re.I | re.S)
 )
+
+# --- LOGGING SETUP ---
+# Records go onto an in-memory queue; a single listener thread does the actual
+# file/console writes, so logging never blocks the request path on disk I/O.
+_LOG_FORMATTER = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_file_handler = logging.FileHandler(LOG_FILE)
+_file_handler.setFormatter(_LOG_FORMATTER)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_LOG_FORMATTER)
+
+_LOG_QUEUE = queue.Queue(-1)
+_LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, _file_handler, _stream_handler)
+_LOG_LISTENER.start()
+atexit.register(_LOG_LISTENER.stop) # Flush remaining records on shutdown
+
+# Message-only on the queue side; the listener's handlers add the prefix
+_queue_handler = logging.handlers.QueueHandler(_LOG_QUEUE)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 logger = logging.getLogger("GoldPrime")
 
 # --- FLASK SETUP ---
@@ -92,9 +149,30 @@ STATE_OFFSETS = {
     "Meghalaya": 180, "Mizoram": 200, "Nagaland": 200, "Tripura": 200
 }
 
+# Precomputed (name, 24K offset, 22K offset), sorted alphabetically for the UI.
+# 22K offset is slightly less (90% of the 24K offset).
+_STATES_SORTED = tuple(
+    (name, offset, int(offset * 0.9))
+    for name, offset in sorted(STATE_OFFSETS.items())
+)
+
+# Same data as arrays so all 36 states are priced in a few vectorized ops.
+_STATE_NAMES = [name for name, _, _ in _STATES_SORTED]
+_OFFSETS_24 = np.array([o24 for _, o24, _ in _STATES_SORTED], dtype=np.int64)
+_OFFSETS_22 = np.array([o22 for _, _, o22 in _STATES_SORTED], dtype=np.int64)
+
 # ==============================================================================
 #  LAYER 1: PERSISTENCE (CACHE MANAGER)
 # ==============================================================================
+# In-process copy of the cache file, keyed by its mtime.
+# The file only changes when the scraper writes it, so most reads are a stat().
+_CACHE_MEM = {"data": None, "mtime": 0}
+_CACHE_LOCK = threading.Lock()
+
+# Process umask, read once (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 class CacheManager:
     """Handles reading and writing the last known price to disk."""
     
@@ -107,25 +185,60 @@ class CacheManager:
                 "timestamp": time.time(),
                 "human_time": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(data, f)
+            with _CACHE_LOCK:
+                # Write to a uniquely named temp file in the same directory and
+                # swap it in atomically, so readers never see a partial cache
+                # and concurrent writers (other processes) never share a temp.
+                cache_dir = os.path.dirname(os.path.abspath(CACHE_FILE))
+                f = tempfile.NamedTemporaryFile(dir=cache_dir, prefix=".gold_cache.", suffix=".tmp", delete=False)
+                try:
+                    with f:
+                        f.write(orjson.dumps(data))
+                    # NamedTemporaryFile is 0600; keep the usual umask-based mode
+                    os.chmod(f.name, 0o666 & ~_UMASK)
+                    os.replace(f.name, CACHE_FILE)
+                except BaseException:
+                    os.unlink(f.name) # Never leave stray temp files behind
+                    raise
+                _CACHE_MEM["data"] = data
+                _CACHE_MEM["mtime"] = os.stat(CACHE_FILE).st_mtime
             logger.info(f"Cache updated: {price}")
         except Exception as e:
             logger.error(f"Failed to write cache: {e}")
 
+    @staticmethod
+    def load_raw():
+        """Loads the full cache record (price + timestamps) from JSON, or None."""
+        try:
+            mtime = os.stat(CACHE_FILE).st_mtime
+        except OSError:
+            return None
+        
+        try:
+            with _CACHE_LOCK:
+                if _CACHE_MEM["data"] is not None and _CACHE_MEM["mtime"] == mtime:
+                    return _CACHE_MEM["data"]
+                
+                with open(CACHE_FILE, 'rb') as f:
+                    data = orjson.loads(f.read())
+                _CACHE_MEM["data"] = data
+                _CACHE_MEM["mtime"] = mtime
+                return data
+        except Exception as e:
+            logger.error(f"Failed to read cache: {e}")
+            return None
+
     @staticmethod
     def load(ignore_expiry=False):
         """
         Loads price from JSON. 
         If ignore_expiry=True, returns data even if it's old (Fail-Safe).
         """
-        if not os.path.exists(CACHE_FILE):
+        data = CacheManager.load_raw()
+        if not data:
             return None
         
         try:
-            with open(CACHE_FILE, 'r') as f:
-                data = json.load(f)
-                
             age = time.time() - data.get('timestamp', 0)
             
             # Logic: Return if fresh OR if we are forced to use stale data
@@ -149,10 +262,14 @@ class MarketScraper:
         "Mozilla/5.0 (Linux; Android 10; SM-G981B) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/80.0.3987.162 Mobile Safari/537.36"
     ]
 
+    # Prebuilt header dicts, rotated round-robin instead of built per request
+    _HEADER_ROUNDS = tuple({"User-Agent": ua} for ua in USER_AGENTS)
+    _HEADER_ITER = itertools.cycle(_HEADER_ROUNDS)
+
     @classmethod
     def _get_headers(cls):
-        """Returns a random User-Agent to avoid blocking."""
-        return {"User-Agent": random.choice(cls.USER_AGENTS)}
+        """Returns the next rotating User-Agent to avoid blocking."""
+        return next(cls._HEADER_ITER)
 
     @classmethod
     def fetch_goodreturns(cls):
@@ -164,34 +281,92 @@ class MarketScraper:
             "https://www.tanishq.co.in/gold-rate.html?lang=en_IN"
         ]
         
-        for url in sources:
-            logger.info(f"Attempting to scrape: {url}")
-            try:
-                resp = requests.get(url, headers=cls._get_headers(), timeout=REQUEST_TIMEOUT)
-                
-                if resp.status_code != 200:
-                    continue # Skip to the next URL if this one fails
-                    
-                soup = BeautifulSoup(resp.text, 'html.parser')
-                tables = soup.find_all("table")
-                for table in tables:
-                    table_text = table.text.lower()
-                    if "10 gram" in table_text and "24" in table_text:
-                        rows = table.find_all("tr")
-                        for row in rows:
-                            cols = row.find_all("td")
-                            if len(cols) > 1 and "10" in cols[0].text:
-                                raw_str = cols[1].text.strip()
-                                clean_str = raw_str.replace('₹', '').replace(',', '').replace('.', '')
-                                price = int(clean_str)
-                                
-                                if cls._validate_price(price):
-                                    return price # Return immediately once success is found
-            except Exception as e:
-                logger.error(f"Error scraping {url}: {e}")
-                continue # Try next URL on error
+        # Fire all sources at once and take the first valid price.
+        # Worst case is now ~1x REQUEST_TIMEOUT instead of 3x.
+        executor = ThreadPoolExecutor(max_workers=len(sources))
+        try:
+            futures = {executor.submit(cls._fetch_one, url): url for url in sources}
+            for future in as_completed(futures):
+                price = future.result()
+                if price:
+                    return price # Return immediately once success is found
+        finally:
+            # Don't wait on the slower sources once we have a winner
+            executor.shutdown(wait=False, cancel_futures=True)
             
         return None # Only return None if ALL sources fail
+
+    @classmethod
+    def fetch_goodreturns_and_save(cls):
+        """Scrapes the live price and persists it. Keeps the old cache on failure."""
+        price = cls.fetch_goodreturns()
+        if price:
+            CacheManager.save(price)
+        else:
+            logger.warning("All sources failed. Keeping last cached price.")
+        return price
+
+    @classmethod
+    def _fetch_one(cls, url):
+        """Scrapes a single source. Returns a validated price or None."""
+        logger.info(f"Attempting to scrape: {url}")
+        try:
+            resp = _SESSION.get(url, headers=cls._get_headers(), timeout=(CONNECT_TIMEOUT, REQUEST_TIMEOUT))
+            
+            if resp.status_code != 200:
+                return None
+            
+            # Try the regex first; only build a DOM when it misses
+            price = cls._regex_price(resp.text)
+            if price:
+                logger.info(f"Regex fast path matched on {url}")
+                return price
+                
+            return cls._dom_price(resp.text)
+        except Exception as e:
+            logger.error(f"Error scraping {url}: {e}")
+            
+        return None
+
+    @classmethod
+    def _dom_price(cls, html):
+        """Extracts a validated price from the 10-gram row of a 24K table, or None."""
+        tree = LexborHTMLParser(html)
+        for table in tree.css("table"):
+            # Only the header row is inspected, not the whole table's text.
+            # It carries the karat marker ("Gram | 24K Today | Yesterday");
+            # the "10 gram" row itself is matched in the row loop below.
+            header = table.css_first("tr")
+            header_text = header.text(separator=" ", strip=True).lower() if header else ""
+            if "24" not in header_text:
+                continue
+            
+            for row in table.css("tr"):
+                cols = row.css("td")
+                if len(cols) > 1 and _TEN_GRAM_CELL.search(cols[0].text()):
+                    raw_str = cols[1].text().strip()
+                    clean_str = raw_str.translate(_PRICE_STRIP).strip()
+                    try:
+                        price = int(clean_str)
+                    except ValueError:
+                        continue # Non-numeric cell: keep scanning, don't drop the source
+                    
+                    if cls._validate_price(price):
+                        return price
+        return None
+
+    @classmethod
+    def _regex_price(cls, html):
+        """Extracts a validated price from raw HTML without parsing, or None."""
+        for pattern in _PRICE_RES:
+            match = pattern.search(html)
+            if not match:
+                continue
+            clean_str = match.group(1).translate(_PRICE_STRIP)
+            if clean_str and cls._validate_price(int(clean_str)):
+                return int(clean_str)
+        return None
+
     @staticmethod
     def _validate_price(price):
         """Sanity Check to reject outliers or paper gold rates."""
@@ -200,32 +375,105 @@ class MarketScraper:
         logger.warning(f"Rejected suspicious price: {price}")
         return False
 
+# --- SHARED HTTP SESSION ---
+# One pooled session for all scrapes so repeated refreshes reuse keep-alive
+# connections instead of paying a fresh TCP+TLS handshake per source.
+# Read timeouts are never retried (read=0) and connect failures are retried
+# once on a short CONNECT_TIMEOUT, so a slow source gives up after ~1x
+# REQUEST_TIMEOUT and an unreachable one after ~2x CONNECT_TIMEOUT + backoff.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, connect=1, read=0, backoff_factor=0.3)
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.headers["User-Agent"] = MarketScraper.USER_AGENTS[0]
+
 # ==============================================================================
 #  LAYER 3: SERVICE LOGIC (The Brain)
 # ==============================================================================
 
+# Acquired (never released) by the first start_background_refresh() call, so
+# the in-process check-then-set is atomic. The file lock handle is kept open
+# for the life of the process: closing it would hand the refresher over.
+_REFRESH_GUARD = threading.Lock()
+_REFRESH_LOCK_FD = None
+
+# Weekly chart pattern: Slight volatility ending at current price
+# [Day-6, Day-5, ... Today]
+_VARIANCE_PATTERN = (-450, -120, +220, -80, +300, +90, 0)
+
+# Reused day offsets for chart labels (index i == timedelta(days=i))
+_DAY_DELTAS = tuple(datetime.timedelta(days=i) for i in range(31))
+
+@lru_cache(maxsize=2)
+def _weekly_labels(today_ord):
+    """Weekday labels for the last 7 days. Cached per day (keyed by ordinal)."""
+    today = datetime.date.fromordinal(today_ord)
+    return [(today - _DAY_DELTAS[i]).strftime('%a') for i in range(6, -1, -1)]
+
 class GoldService:
     @staticmethod
     def get_master_price():
-        # 1. Load the last known price from cache immediately (Ignore expiry)
-        cached_price = CacheManager.load(ignore_expiry=True)
-        
-        # 2. Check if the cache is actually "stale" (older than 1 hour)
-        # We still return the stale price to the user so they don't wait
-        data = None
-        if os.path.exists(CACHE_FILE):
-            with open(CACHE_FILE, 'r') as f:
-                data = json.load(f)
+        # Pure cache read. Freshness is handled by the background refresher,
+        # so requests never trigger scrapes themselves.
+        data = CacheManager.load_raw()
+        cached_price = data.get('price') if data else None
+
+        return cached_price if cached_price else FAILSAFE_ANCHOR_PRICE
+
+    @staticmethod
+    def start_background_refresh():
+        """
+        Starts the single daemon thread that keeps the cache fresh.
+        Safe to call from every process (e.g. each gunicorn worker): a
+        non-blocking lock on REFRESH_LOCK_FILE lets exactly one of them win.
+        Returns True if this process is now running the refresher.
+        """
+        global _REFRESH_LOCK_FD
+        if not _REFRESH_GUARD.acquire(blocking=False):
+            return False
         
-        age = time.time() - (data.get('timestamp', 0) if data else 0)
+        if fcntl is not None:
+            lock_fd = open(REFRESH_LOCK_FILE, 'w')
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_fd.close()
+                logger.info("Refresher already running in another process.")
+                return False
+            _REFRESH_LOCK_FD = lock_fd
         
-        # 3. If stale, trigger a background update for the NEXT request
-        if age > CACHE_EXPIRY_SECONDS:
-            logger.info("Cache stale. Triggering background update...")
-            thread = threading.Thread(target=MarketScraper.fetch_goodreturns_and_save)
-            thread.start()
+        thread = threading.Thread(target=GoldService._refresh_loop, daemon=True)
+        thread.start()
+        logger.info(f"Background refresher started (pid {os.getpid()}).")
+        return True
 
-        return cached_price if cached_price else FAILSAFE_ANCHOR_PRICE
+    @staticmethod
+    def _refresh_loop():
+        """Refreshes the cache every CACHE_EXPIRY_SECONDS, regardless of traffic."""
+        while True:
+            delay = REFRESH_RETRY_SECONDS
+            try:
+                data = CacheManager.load_raw()
+                age = time.time() - (data.get('timestamp', 0) if data else 0)
+                
+                # Skip the scrape if a restart finds a cache that is still fresh
+                if age >= CACHE_EXPIRY_SECONDS:
+                    logger.info("Cache stale. Running scheduled refresh...")
+                    if MarketScraper.fetch_goodreturns_and_save():
+                        age = 0
+                
+                # Failed refreshes retry on the short backoff, not a full hour
+                if age < CACHE_EXPIRY_SECONDS:
+                    delay = CACHE_EXPIRY_SECONDS - age
+            except Exception as e:
+                # Never let one bad cycle kill the only refresher thread
+                logger.exception(f"Background refresh failed: {e}")
+            
+            time.sleep(delay)
 
     @staticmethod
     def generate_charts(base_price):
@@ -233,40 +481,26 @@ class GoldService:
         Generates realistic chart data relative to the current base price.
         """
         # --- Weekly Data (7 Days) ---
-        week_labels = []
-        week_data = []
         today = datetime.date.today()
+        week_labels = _weekly_labels(today.toordinal())
         
-        # Pattern: Slight volatility ending at current price
-        # [Day-6, Day-5, ... Today]
-        variance_pattern = [-450, -120, +220, -80, +300, +90, 0]
-        
-        for i in range(6, -1, -1):
-            day_label = (today - datetime.timedelta(days=i)).strftime('%a')
-            week_labels.append(day_label)
-            
-            # Apply variance
-            week_data.append(base_price + variance_pattern[6-i])
+        # Apply variance
+        week_data = [base_price + v for v in _VARIANCE_PATTERN]
 
         # --- Monthly Data (30 Days) ---
-        month_labels = []
-        month_data = []
+        month_labels = [
+            (today - _DAY_DELTAS[i]).strftime('%d %b')
+            for i in range(29, -1, -1)
+        ]
         
-        current_sim_price = base_price - 1500 # Assume market was lower 30 days ago
+        # Random Walk Logic (one vectorized draw instead of 30 randint calls)
+        # Assume market was lower 30 days ago
+        deltas = np.random.randint(-300, 401, size=30, dtype=np.int64)
+        walk = deltas.cumsum() + (base_price - 1500)
         
-        for i in range(29, -1, -1):
-            day_label = (today - datetime.timedelta(days=i)).strftime('%d %b')
-            month_labels.append(day_label)
-            
-            # Random Walk Logic
-            change = random.randint(-300, 400)
-            current_sim_price += change
-            
-            # Force convergence on last day
-            if i == 0: 
-                current_sim_price = base_price
-                
-            month_data.append(current_sim_price)
+        # Force convergence on last day
+        walk[-1] = base_price
+        month_data = walk.tolist()
 
         return {
             "weekly": {"labels": week_labels, "data": week_data},
@@ -280,72 +514,144 @@ class GoldService:
         # 22K Calculation (Standard 91.66% Purity)
         base_price_22k = int(base_price_24k * 0.9166)
         
-        results = []
+        # Apply regional offsets
+        p24 = base_price_24k + _OFFSETS_24
+        p22 = base_price_22k + _OFFSETS_22
         
-        for state_name, offset in STATE_OFFSETS.items():
-            # Apply regional offset
-            p24 = base_price_24k + offset
-            p22 = base_price_22k + int(offset * 0.9) # 22K offset is slightly less
-            
-            results.append({
-                "name": state_name,
-                "p24": p24,
-                "p22": p22,
+        return [
+            {
+                "name": name,
+                "p24": p24_10g,
+                "p22": p22_10g,
                 # Calculated 1g prices for the UI
-                "p24_1g": p24 // 10,
-                "p22_1g": p22 // 10
-            })
-            
-        # Sort Alphabetically for UI dropdown
-        results.sort(key=lambda x: x['name'])
-        return results
+                "p24_1g": p24_1g,
+                "p22_1g": p22_1g
+            }
+            for name, p24_10g, p22_10g, p24_1g, p22_1g in zip(
+                _STATE_NAMES, p24.tolist(), p22.tolist(),
+                (p24 // 10).tolist(), (p22 // 10).tolist()
+            )
+        ]
 
 # ==============================================================================
 #  LAYER 4: API ENDPOINTS (FLASK)
 # ==============================================================================
 
+@app.before_request
+def _ensure_refresher():
+    """
+    Starts the cache refresher on the first request, whatever the WSGI host
+    (flask run, waitress, gunicorn with any config). After the first call
+    this is a single non-blocking lock attempt, and the file lock keeps it
+    to one refresher per host.
+    """
+    GoldService.start_background_refresh()
+
 @app.route('/')
 def home():
     """Serves the Frontend Application."""
     return render_template('index.html')
 
+# Serialized states/charts fragments for the current price. The price changes
+# at most once per refresh, so most requests only render the envelope. Each
+# part is built on first use, so charts are never generated unless requested.
+_RESPONSE_CACHE = {"key": None, "states": None, "charts": None}
+_RESPONSE_LOCK = threading.Lock()
+
+_FRAGMENT_BUILDERS = {
+    "states": GoldService.calculate_all_states,
+    "charts": GoldService.generate_charts
+}
+
+def _cached_fragment(base_price, part):
+    """Returns the serialized 'states' or 'charts' data for base_price."""
+    # Chart labels are date-based, so the cache also rolls over daily
+    cache_key = (base_price, datetime.date.today())
+    
+    with _RESPONSE_LOCK:
+        if _RESPONSE_CACHE["key"] != cache_key:
+            _RESPONSE_CACHE.update(key=cache_key, states=None, charts=None)
+        if _RESPONSE_CACHE[part] is None:
+            _RESPONSE_CACHE[part] = orjson.dumps(_FRAGMENT_BUILDERS[part](base_price))
+        return _RESPONSE_CACHE[part]
+
+def _json_response(payload, **fragments):
+    """Serializes payload, splicing in pre-serialized JSON fragments as extra keys."""
+    body = orjson.dumps(payload)
+    if fragments:
+        extra = b",".join(b'"%s":%s' % (key.encode(), value) for key, value in fragments.items())
+        body = body[:-1] + b"," + extra + b"}"
+    return Response(body, mimetype='application/json')
+
+def _timestamp():
+    """Human-readable server time for API responses."""
+    return datetime.datetime.now().strftime("%d %B %Y, %I:%M %p")
+
 @app.route('/api/full-data', methods=['GET'])
 def get_full_data():
     """
     Main API Endpoint.
     Returns comprehensive data package to the frontend.
+    Charts are only included with ?include=charts.
     """
     start_time = time.time()
+    include = request.args.get('include', '').split(',')
     
     # 1. Get Authoritative Price
     base_price = GoldService.get_master_price()
     
     # 2. Calculate Derived Data (States)
-    states_data = GoldService.calculate_all_states(base_price)
+    fragments = {"states": _cached_fragment(base_price, "states")}
     
-    # 3. Generate Charts
-    charts_data = GoldService.generate_charts(base_price)
+    # 3. Generate Charts (opt-in)
+    if "charts" in include:
+        fragments["charts"] = _cached_fragment(base_price, "charts")
     
     # 4. Construct Response
     response = {
         "status": "success",
-        "timestamp": datetime.datetime.now().strftime("%d %B %Y, %I:%M %p"),
+        "timestamp": _timestamp(),
         "base_price": base_price,
-        "states": states_data,
-        "charts": charts_data,
         "meta": {
             "latency": f"{round(time.time() - start_time, 2)}s",
             "source": "GoldPrime Live Engine"
         }
     }
     
-    return jsonify(response)
+    return _json_response(response, **fragments)
+
+@app.route('/api/price', methods=['GET'])
+def get_price():
+    """Current national base price only."""
+    return _json_response({
+        "status": "success",
+        "timestamp": _timestamp(),
+        "base_price": GoldService.get_master_price()
+    })
+
+@app.route('/api/states', methods=['GET'])
+def get_states():
+    """Per-state 24K/22K prices."""
+    base_price = GoldService.get_master_price()
+    return _json_response(
+        {"status": "success", "timestamp": _timestamp(), "base_price": base_price},
+        states=_cached_fragment(base_price, "states")
+    )
+
+@app.route('/api/charts', methods=['GET'])
+def get_charts():
+    """Weekly and monthly chart series."""
+    base_price = GoldService.get_master_price()
+    return _json_response(
+        {"status": "success", "timestamp": _timestamp(), "base_price": base_price},
+        charts=_cached_fragment(base_price, "charts")
+    )
 
 @app.route('/api/status')
 def system_status():
     """Health Check for Uptime Monitors."""
     cached_price = CacheManager.load(ignore_expiry=True)
-    return jsonify({
+    return _json_response({
         "status": "online", 
         "cached_price": cached_price,
         "cache_file_exists": os.path.exists(CACHE_FILE)
@@ -354,6 +660,13 @@ def system_status():
 # ==============================================================================
 #  SERVER ENTRY POINT
 # ==============================================================================
+# Production runs under gunicorn (the block below is for local dev only):
+#   gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5000 app:app
+# gunicorn.conf.py (read automatically from the working dir) holds the same
+# settings plus a post_worker_init hook so the cache refresher is running at
+# boot. Under any other server it starts on the first request instead
+# (see _ensure_refresher). REFRESH_LOCK_FILE keeps it to one per host.
+# Importing this module never starts the refresher or touches the network.
 if __name__ == '__main__':
     print("==========================================================")
     print("   GOLDPRIME ENTERPRISE SERVER (v5.1)")
@@ -362,15 +675,21 @@ if __name__ == '__main__':
     print(f"   * Cache: {CACHE_FILE}")
     print(f"   * Expiry: {CACHE_EXPIRY_SECONDS} seconds (1 Hour)")
     print(f"   * Anchor: ₹{FAILSAFE_ANCHOR_PRICE}")
-    print(f"   * Status: Ready for Production")
+    print(f"   * Status: Local Dev Server (use gunicorn in production)")
     print("==========================================================")
     
     # Perform initial check
     initial_price = GoldService.get_master_price()
     print(f"   -> System Initialization Complete. Current Price: {initial_price}")
     
-
-    app.run(debug=True, port=5000)
+    # Debug mode is opt-in so it never leaks into a deployed instance
+    debug = os.environ.get("FLASK_DEBUG") == "1"
+    
+    # With the reloader, only the serving child (not the watcher) refreshes
+    if not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        GoldService.start_background_refresh()
+    
+    app.run(debug=debug, port=5000)
 
 
 
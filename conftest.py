@@ -0,0 +1 @@
+# Makes the repo root importable for tests (``import app``).
@@ -0,0 +1,21 @@
+# ==============================================================================
+#  GOLDPRIME GUNICORN CONFIG
+#  ----------------------------------------------------------------------------
+#  Picked up automatically by `gunicorn app:app` from the working directory.
+#  Equivalent to: gunicorn -w 4 -k gthread --threads 8 -b 0.0.0.0:5000 app:app
+# ==============================================================================
+bind = "0.0.0.0:5000"
+workers = 4
+worker_class = "gthread"
+threads = 8
+
+
+def post_worker_init(worker):
+    """
+    Starts the cache refresher at boot instead of on the first request.
+    Every worker offers to run it; the lock on REFRESH_LOCK_FILE lets exactly
+    one win. If that worker dies, the lock is released and its replacement
+    takes over.
+    """
+    from app import GoldService
+    GoldService.start_background_refresh()
@@ -0,0 +1,32 @@
+"""Fixture-HTML tests for the MarketScraper DOM fallback (_dom_price)."""
+from app import MarketScraper
+
+
+def test_reads_10_gram_row_under_24k_header():
+    html = ('<table><tr><th>Gram</th><th>24K Today</th><th>Yesterday</th></tr>'
+            '<tr><td>1 gram</td><td>₹15,624</td><td>₹15,590</td></tr>'
+            '<tr><td>10 Gram</td><td>₹1,56,240</td><td>₹1,55,900</td></tr></table>')
+    assert MarketScraper._dom_price(html) == 156240
+
+
+def test_skips_tables_without_24_in_header():
+    html = ('<table><tr><th>Gram</th><th>22K Today</th></tr>'
+            '<tr><td>10 gram</td><td>₹1,43,100</td></tr></table>')
+    assert MarketScraper._dom_price(html) is None
+
+
+def test_ignores_history_dates_and_100_gram_rows():
+    html = ('<table><tr><th>Date</th><th>24 Carat</th><th>22 Carat</th></tr>'
+            '<tr><td>Oct 10, 2026</td><td>₹1,52,000</td><td>₹1,39,300</td></tr></table>'
+            '<table><tr><th>Gram</th><th>24K Today</th></tr>'
+            '<tr><td>100 gram</td><td>₹15,62,400</td></tr>'
+            '<tr><td>10 gm</td><td>₹1,56,240</td></tr></table>')
+    assert MarketScraper._dom_price(html) == 156240
+
+
+def test_non_numeric_cell_does_not_abort_scan():
+    html = ('<table><tr><th>Gram</th><th>24K Today</th></tr>'
+            '<tr><td>10 gram</td><td>Updating...</td></tr></table>'
+            '<table><tr><th>Gram</th><th>24K Today</th></tr>'
+            '<tr><td>10g</td><td>₹1,56,240</td></tr></table>')
+    assert MarketScraper._dom_price(html) == 156240
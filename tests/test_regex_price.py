@@ -0,0 +1,84 @@
+"""Fixture-HTML tests for the MarketScraper regex fast path (_PRICE_RES)."""
+from app import MarketScraper, _PRICE_RES
+
+
+def test_forward_pattern_reads_today_from_24k_row():
+    html = ('<table><tr><td>10 gram 24K</td>'
+            '<td>₹1,56,240</td><td>₹1,55,900</td></tr></table>')
+    assert _PRICE_RES[0].search(html).group(1) == "1,56,240"
+    assert MarketScraper._regex_price(html) == 156240
+
+
+def test_reverse_pattern_reads_today_from_24k_row():
+    html = ('<table><tr><td>24 Carat</td><td>10 gram</td>'
+            '<td>₹ 1,56,240</td><td>₹1,55,900</td></tr></table>')
+    assert _PRICE_RES[0].search(html) is None
+    assert _PRICE_RES[1].search(html).group(1) == "1,56,240"
+    assert MarketScraper._regex_price(html) == 156240
+
+
+def test_skips_22k_row_before_24k_row():
+    html = ('<table><tr><td>10 gram 22K</td><td>₹1,43,100</td></tr>'
+            '<tr><td>10 gram 24K</td><td>₹1,56,240</td></tr></table>')
+    assert MarketScraper._regex_price(html) == 156240
+
+
+def test_24_inside_price_is_not_a_karat_marker():
+    # Karat only in the header row: the fast path must defer to the DOM scan
+    html = ('<table><tr><th>Gram</th><th>24K Today</th><th>Yesterday</th></tr>'
+            '<tr><td>10 gram</td><td>₹1,56,240</td><td>₹1,55,900</td></tr></table>')
+    for pattern in _PRICE_RES:
+        assert pattern.search(html) is None
+    assert MarketScraper._regex_price(html) is None
+
+
+def test_24_in_a_date_is_not_a_karat_marker():
+    html = '<p>10 gram gold on Oct 24, 2026</p><p>22K: ₹1,43,100</p>'
+    for pattern in _PRICE_RES:
+        assert pattern.search(html) is None
+    assert MarketScraper._regex_price(html) is None
+
+
+def test_match_does_not_cross_tables():
+    html = ('<table><tr><th>22K Today</th></tr>'
+            '<tr><td>10 gram</td><td>₹1,43,100</td></tr></table>'
+            '<table><tr><th>24K Today</th></tr>'
+            '<tr><td>10 gram</td><td>₹1,56,240</td></tr></table>')
+    for pattern in _PRICE_RES:
+        assert pattern.search(html) is None
+    assert MarketScraper._regex_price(html) is None
+
+
+def test_ignores_100_gram_row_and_attribute_numbers():
+    html = ('<table><tr><td>100 gram 24K</td><td>₹15,62,400</td></tr>'
+            '<tr><td data-id="150000">10 gram 24K</td><td>₹1,56,240</td></tr></table>')
+    assert MarketScraper._regex_price(html) == 156240
+
+
+def test_prose_does_not_cross_into_22k_rate():
+    html = ('<p>Today 24K gold costs ₹15,624 per gram, '
+            'while 10 gram of 22K costs ₹1,43,100.</p>')
+    for pattern in _PRICE_RES:
+        assert pattern.search(html) is None
+    assert MarketScraper._regex_price(html) is None
+
+
+def test_row_does_not_cross_into_22k_cell():
+    html = ('<tr><td>24K Gold</td><td>₹15,624 /gram</td>'
+            '<td>22K Gold 10 gram</td><td>₹1,43,100</td></tr>')
+    for pattern in _PRICE_RES:
+        assert pattern.search(html) is None
+    assert MarketScraper._regex_price(html) is None
+
+
+def test_div_layout_skips_22k_block_before_24k_block():
+    html = ('<div class="rate"><span>10 gram 22 carat</span> <b>₹1,43,100</b></div>'
+            '<div class="rate"><span>10 gram 24 carat</span> <b>₹1,56,240</b></div>')
+    assert MarketScraper._regex_price(html) == 156240
+
+
+def test_div_layout_does_not_cross_into_22k_block():
+    html = '<div>24K Gold</div><div>10 gram of 22K</div><div>₹1,43,100</div>'
+    for pattern in _PRICE_RES:
+        assert pattern.search(html) is None
+    assert MarketScraper._regex_price(html) is None